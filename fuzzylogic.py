@@ -1,16 +1,29 @@
+import os
+import pickle
+import hashlib
+import itertools
+import functools
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
+from skfuzzy.control.term import Term, TermAggregate
 
 
 # ----------------------------
 # Universes (input/output ranges)
 # ----------------------------
-deadline_days = ctrl.Antecedent(np.arange(0, 31, 1), 'deadline_days')  # 0–30 days
-importance = ctrl.Antecedent(np.arange(0, 11, 1), 'importance')        # 0–10
-difficulty = ctrl.Antecedent(np.arange(0, 11, 1), 'difficulty')        # 0–10
+# int16 is plenty for these integer grids (skfuzzy promotes to float where needed)
+deadline_days = ctrl.Antecedent(np.arange(0, 31, dtype=np.int16), 'deadline_days')  # 0–30 days
+importance = ctrl.Antecedent(np.arange(0, 11, dtype=np.int16), 'importance')        # 0–10
+difficulty = ctrl.Antecedent(np.arange(0, 11, dtype=np.int16), 'difficulty')        # 0–10
 
-priority = ctrl.Consequent(np.arange(0, 101, 1), 'priority')           # 0–100
+priority = ctrl.Consequent(np.arange(0, 101, dtype=np.int16), 'priority')          # 0–100
+
+# Universe bounds as plain floats, so hot paths don't rescan the arrays
+_DD_LO, _DD_HI = float(deadline_days.universe.min()), float(deadline_days.universe.max())
+_IM_LO, _IM_HI = float(importance.universe.min()), float(importance.universe.max())
+_DF_LO, _DF_HI = float(difficulty.universe.min()), float(difficulty.universe.max())
+_PR_LO = float(priority.universe.min())
 
 # ----------------------------
 # Membership functions
@@ -44,6 +57,23 @@ priority['medium']    = fuzz.trimf(priority.universe,  [35, 50, 65])
 priority['high']      = fuzz.trimf(priority.universe,  [55, 70, 85])
 priority['very_high'] = fuzz.trapmf(priority.universe, [75, 90, 100, 100])
 
+# Freeze each variable's MFs into one contiguous, read-only float64 block
+# (one row per term, in definition order). Each term's .mf becomes a view
+# of its row, so skfuzzy and the NumPy code below share the same memory.
+# float64, like skfuzzy's own MFs: narrower rows shift scores in the last
+# bits, which flips labels at exact ties such as 60.0.
+def _freeze_mfs(var) -> np.ndarray:
+    stacked = np.ascontiguousarray(np.stack([term.mf for term in var.terms.values()]), dtype=np.float64)
+    stacked.flags.writeable = False
+    for row, term in zip(stacked, var.terms.values()):
+        term.mf = row
+    return stacked
+
+ALL_DEADLINE_MFS = _freeze_mfs(deadline_days)      # close, moderate, far
+ALL_IMPORTANCE_MFS = _freeze_mfs(importance)       # low, medium, high
+ALL_DIFFICULTY_MFS = _freeze_mfs(difficulty)       # easy, moderate, hard
+ALL_PRIORITY_MFS = _freeze_mfs(priority)           # very_low .. very_high
+
 # ----------------------------
 # Rules
 # ----------------------------
@@ -75,23 +105,339 @@ rules = [
   
 ]
 
-# Build the control system
-priority_ctrl = ctrl.ControlSystem(rules)
-priority_engine = ctrl.ControlSystemSimulation(priority_ctrl)
+# ----------------------------
+# skfuzzy control system (lazy)
+# ----------------------------
+# Scoring runs on the kernel + lookup table below, so the skfuzzy
+# ControlSystem is only built when `priority_ctrl`/`priority_engine` are
+# actually used. It is pickled under .cache/, keyed by a hash of this file,
+# so later processes unpickle instead of re-analysing the rule graph. When
+# loaded from the cache its variables are copies of the ones defined above.
+CTRL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+@functools.lru_cache(maxsize=None)
+def _source_hash() -> str:
+    with open(__file__, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _save_cache(path, write) -> None:
+    """Best-effort cache write: write(f) into a sibling temp file, then swap it in,
+    so an interrupted dump never leaves a truncated file behind."""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+@functools.lru_cache(maxsize=None)
+def _control_system():
+    path = os.path.join(CTRL_CACHE_DIR, f'ctrl_{_source_hash()}.pkl')
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass  # missing, truncated or unreadable: rebuild (and overwrite) below
+
+    system = ctrl.ControlSystem(rules)
+    built = (system, ctrl.ControlSystemSimulation(system))
+    _save_cache(path, lambda f: pickle.dump(built, f))
+    return built
+
+def __getattr__(name):
+    if name == 'priority_ctrl':
+        return _control_system()[0]
+    if name == 'priority_engine':
+        return _control_system()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ----------------------------
+# Compiled inference kernel
+# ----------------------------
+# Same Mamdani inference as ControlSystemSimulation.compute() (min for AND,
+# max accumulation, cut-point upsampling + piecewise-linear centroid), but
+# over flat arrays so numba can compile it. The arrays are read off the
+# skfuzzy objects above, so the rules list stays the single source of truth.
+# numba is optional and only imported the first time the kernel runs, which
+# is never in a process that finds a valid cached table.
+def _rule_table():
+    inputs = (deadline_days, importance, difficulty)
+    outputs = list(priority.terms)
+    ants = np.full((len(rules), len(inputs)), -1, dtype=np.int64)
+    outs = np.empty(len(rules), dtype=np.int64)
+    weights = np.empty(len(rules), dtype=np.float64)
+
+    def visit(node, r):
+        if isinstance(node, TermAggregate):
+            if node.kind != 'and':
+                raise ValueError(f"Rule {r}: only AND-ed antecedents are supported, got {node.kind!r}")
+            visit(node.term1, r)
+            visit(node.term2, r)
+        elif isinstance(node, Term):
+            v = next(i for i, var in enumerate(inputs) if var is node.parent)
+            t = list(node.parent.terms).index(node.label)
+            if ants[r, v] not in (-1, t):
+                raise ValueError(f"Rule {r}: two terms of {node.parent.label!r}")
+            ants[r, v] = t
+        else:
+            raise ValueError(f"Rule {r}: unsupported antecedent {node!r}")
+
+    for r, rule in enumerate(rules):
+        visit(rule.antecedent, r)
+        if len(rule.consequent) != 1:
+            raise ValueError(f"Rule {r}: expected a single consequent")
+        outs[r] = outputs.index(rule.consequent[0].term.label)
+        weights[r] = rule.consequent[0].weight
+    return ants, outs, weights
+
+_KERNEL_TABLES = (
+    deadline_days.universe.astype(np.float64), ALL_DEADLINE_MFS,
+    importance.universe.astype(np.float64), ALL_IMPORTANCE_MFS,
+    difficulty.universe.astype(np.float64), ALL_DIFFICULTY_MFS,
+    *_rule_table(),
+    priority.universe.astype(np.float64), ALL_PRIORITY_MFS,
+)
+
+def _mamdani(d, im, df, d_u, d_mf, i_u, i_mf, f_u, f_mf, ants, outs, weights, p_u, p_mf):
+    # Fuzzify inputs
+    mu_d = np.empty(d_mf.shape[0])
+    for k in range(d_mf.shape[0]):
+        mu_d[k] = np.interp(d, d_u, d_mf[k])
+    mu_i = np.empty(i_mf.shape[0])
+    for k in range(i_mf.shape[0]):
+        mu_i[k] = np.interp(im, i_u, i_mf[k])
+    mu_f = np.empty(f_mf.shape[0])
+    for k in range(f_mf.shape[0]):
+        mu_f[k] = np.interp(df, f_u, f_mf[k])
+
+    # Rule firing (AND = min), accumulated per output term (max)
+    n_out = p_mf.shape[0]
+    cut = np.zeros(n_out)
+    for r in range(ants.shape[0]):
+        s = 1.0
+        if ants[r, 0] >= 0:
+            s = min(s, mu_d[ants[r, 0]])
+        if ants[r, 1] >= 0:
+            s = min(s, mu_i[ants[r, 1]])
+        if ants[r, 2] >= 0:
+            s = min(s, mu_f[ants[r, 2]])
+        cut[outs[r]] = max(cut[outs[r]], s * weights[r])
+
+    # Upsample the output universe with the points where each MF meets its cut
+    n = p_u.shape[0]
+    pts = np.empty(n + n_out * (n - 1))
+    pts[:n] = p_u
+    m = n
+    for k in range(n_out):
+        c = cut[k]
+        for j in range(n - 1):
+            if c == 0.0:
+                crosses = (p_mf[k, j] > c) != (p_mf[k, j + 1] > c)
+            else:
+                crosses = (p_mf[k, j] >= c) != (p_mf[k, j + 1] >= c)
+            if crosses:
+                pts[m] = p_u[j] + (c - p_mf[k, j]) * (p_u[j + 1] - p_u[j]) / (p_mf[k, j + 1] - p_mf[k, j])
+                m += 1
+    xs = np.unique(pts[:m])
+
+    # Aggregate the clipped output MFs; xs is sorted, so walk the universe
+    # interval alongside it instead of a fresh np.interp search per point
+    agg = np.zeros(xs.shape[0])
+    q = 0
+    for j in range(xs.shape[0]):
+        while q < n - 2 and xs[j] >= p_u[q + 1]:
+            q += 1
+        for k in range(n_out):
+            if xs[j] == p_u[n - 1]:
+                y = p_mf[k, n - 1]
+            else:
+                slope = (p_mf[k, q + 1] - p_mf[k, q]) / (p_u[q + 1] - p_u[q])
+                y = slope * (xs[j] - p_u[q]) + p_mf[k, q]
+            agg[j] = max(agg[j], min(cut[k], y))
+    if agg.sum() == 0.0:
+        return np.nan  # no rule fired
+
+    # Centroid of the piecewise-linear aggregate
+    sum_moment_area = 0.0
+    sum_area = 0.0
+    for j in range(1, xs.shape[0]):
+        x1 = xs[j - 1]
+        x2 = xs[j]
+        y1 = agg[j - 1]
+        y2 = agg[j]
+        if not (y1 == y2 == 0.0 or x1 == x2):
+            if y1 == y2:
+                moment = 0.5 * (x1 + x2)
+                area = (x2 - x1) * y1
+            elif y1 == 0.0 and y2 != 0.0:
+                moment = 2.0 / 3.0 * (x2 - x1) + x1
+                area = 0.5 * (x2 - x1) * y2
+            elif y2 == 0.0 and y1 != 0.0:
+                moment = 1.0 / 3.0 * (x2 - x1) + x1
+                area = 0.5 * (x2 - x1) * y1
+            else:
+                moment = (2.0 / 3.0 * (x2 - x1) * (y2 + 0.5 * y1)) / (y1 + y2) + x1
+                area = 0.5 * (x2 - x1) * (y1 + y2)
+            sum_moment_area += moment * area
+            sum_area += area
+    return sum_moment_area / max(sum_area, np.finfo(np.float64).eps)
+
+# Both kernels get explicit signatures (typed from the actual tables, so the
+# read-only MF blocks and platform int width match), so numba compiles them
+# eagerly here, or loads the on-disk cache, instead of on the first call.
+_mamdani_impl = _mamdani   # rebound to the compiled kernel by _kernel()
+_prange = range            # numba.prange once _batch_kernel() compiles
+
+@functools.lru_cache(maxsize=None)
+def _kernel():
+    global _mamdani_impl
+    try:
+        from numba import njit, float64, typeof
+    except ImportError:
+        return _mamdani  # plain Python fallback
+    sig = float64(float64, float64, float64, *map(typeof, _KERNEL_TABLES))
+    _mamdani_impl = njit(sig, cache=True)(_mamdani)
+    return _mamdani_impl
+
+def compute_priority(d: float, im: float, df: float) -> float:
+    """
+    Exact crisp priority via the compiled kernel, no table interpolation.
+    Inputs are clamped to their universes; NaN if no rule fires.
+    """
+    d = min(max(float(d), _DD_LO), _DD_HI)
+    im = min(max(float(im), _IM_LO), _IM_HI)
+    df = min(max(float(df), _DF_LO), _DF_HI)
+    return _kernel()(d, im, df, *_KERNEL_TABLES)
+
+# Module-level (not a closure over the kernel) so numba's on-disk cache can be reused
+def _mamdani_batch(d, im, df, out, tables):
+    for k in _prange(d.shape[0]):
+        out[k] = _mamdani_impl(d[k], im[k], df[k], *tables)
+
+@functools.lru_cache(maxsize=None)
+def _batch_kernel():
+    global _prange
+    _kernel()
+    try:
+        from numba import njit, prange, float64, none, typeof
+    except ImportError:
+        return _mamdani_batch
+    _prange = prange
+    sig = none(float64[::1], float64[::1], float64[::1], float64[::1], typeof(_KERNEL_TABLES))
+    return njit(sig, parallel=True, cache=True)(_mamdani_batch)
+
+def compute_priority_batch(days, imp, diff) -> np.ndarray:
+    """
+    compute_priority over equal-length 1-D array-likes, one parallel
+    (numba prange) loop. Same clamping; NaN where no rule fires.
+    """
+    d = np.clip(np.asarray(days, dtype=np.float64), _DD_LO, _DD_HI)
+    im = np.clip(np.asarray(imp, dtype=np.float64), _IM_LO, _IM_HI)
+    df = np.clip(np.asarray(diff, dtype=np.float64), _DF_LO, _DF_HI)
+    out = np.empty(d.shape[0], dtype=np.float64)
+    _batch_kernel()(d, im, df, out, _KERNEL_TABLES)
+    return out
+
+# ----------------------------
+# Lookup table: crisp score for every integer grid point
+# ----------------------------
+# The input space is only 31×11×11 = 3751 integer points, so we run the
+# kernel once per point and integer inputs (the common case) are a table
+# read instead of inference. Inputs between grid points run the kernel:
+# blending neighbouring cells is up to ~6 points off the real inference.
+# Points where no rule fires are stored as NaN. The table is saved under
+# .cache/ keyed by the same hash of this file as the pickle, so any edit
+# (or restoring an older copy with its old timestamp) builds a fresh one.
+LUT_PATH = os.path.join(CTRL_CACHE_DIR, f'lut_{_source_hash()}.npy')
+LUT_SHAPE = (len(deadline_days.universe), len(importance.universe), len(difficulty.universe))
+
+def _build_lut() -> np.ndarray:
+    lut = np.empty(LUT_SHAPE, dtype=np.float64)
+    for idx in itertools.product(*(range(n) for n in LUT_SHAPE)):
+        lut[idx] = compute_priority(
+            deadline_days.universe[idx[0]],
+            importance.universe[idx[1]],
+            difficulty.universe[idx[2]],
+        )
+    return lut
+
+def _load_lut() -> np.ndarray:
+    try:
+        lut = np.load(LUT_PATH, mmap_mode='r')
+        if lut.shape == LUT_SHAPE:
+            return lut
+    except Exception:
+        pass  # missing, truncated or unreadable: rebuild (and overwrite) below
+    lut = _build_lut()
+    _save_cache(LUT_PATH, lambda f: np.save(f, lut))  # on a read-only install it just lives in memory
+    return lut
+
+PRIORITY_LUT = _load_lut()
+
+def _lookup_or_compute(d, im, df):
+    """
+    Crisp scores at (clipped) input values; scalars or equally-shaped arrays.
+    Integer grid points are read from PRIORITY_LUT, everything else goes
+    through compute_priority_batch. NaN where no rule fires.
+    """
+    v = np.stack([np.asarray(d, dtype=np.float64), np.asarray(im, dtype=np.float64), np.asarray(df, dtype=np.float64)])
+    x = v - np.array([_DD_LO, _IM_LO, _DF_LO]).reshape((3,) + (1,) * (v.ndim - 1))
+    idx = np.rint(x)
+    on_grid = (idx == x).all(axis=0)
+    i = idx.astype(np.intp)
+
+    out = np.empty(v.shape[1:], dtype=np.float64)
+    out[on_grid] = PRIORITY_LUT[i[0][on_grid], i[1][on_grid], i[2][on_grid]]
+    off = ~on_grid
+    if off.any():
+        out[off] = compute_priority_batch(v[0][off], v[1][off], v[2][off])
+    return out
 
 # ----------------------------
 # Helper: crisp score -> label
 # ----------------------------
-def _label_for_priority(score: float) -> str:
-    # Compute membership strengths at the crisp score and pick the max label
-    memberships = {
-        'very low': fuzz.interp_membership(priority.universe, priority['very_low'].mf, score),
-        'low':      fuzz.interp_membership(priority.universe, priority['low'].mf, score),
-        'medium':   fuzz.interp_membership(priority.universe, priority['medium'].mf, score),
-        'high':     fuzz.interp_membership(priority.universe, priority['high'].mf, score),
-        'very high':fuzz.interp_membership(priority.universe, priority['very_high'].mf, score),
-    }
-    return max(memberships.items(), key=lambda x: x[1])[0]
+# The label whose output MF is highest at the exact score, interpolated like
+# fuzz.interp_membership (argmax keeps the first label on ties, like max()
+# over the old dict did). Scores are not rounded to the integer grid first:
+# that flips the label within 0.5 of every crossover (20/40/60/80).
+LABELS = ['very low', 'low', 'medium', 'high', 'very high']
+_PR_U = priority.universe.astype(np.float64)
+_PR_MFS = ALL_PRIORITY_MFS
+_PR_ROWS = _PR_MFS.tolist()   # same values as plain lists, for the scalar path
+
+def _label_indices(scores) -> np.ndarray:
+    s = np.asarray(scores, dtype=np.float64)
+    return np.stack([np.interp(s, _PR_U, row, left=0.0, right=0.0) for row in _PR_MFS]).argmax(axis=0)
+
+def label_for_priority(score: float) -> str:
+    """Linguistic label ('very low'..'very high') for a crisp score in [0,100]."""
+    # np.interp's formula on the unit-spaced universe, without the array round-trip
+    x = float(score) - _PR_LO
+    if not 0.0 < x < len(_PR_U) - 1:
+        return LABELS[int(_label_indices(score))]  # ends, outside the universe, NaN
+    j = int(x)
+    m = [(r[j + 1] - r[j]) * (x - j) + r[j] for r in _PR_ROWS]
+    return LABELS[m.index(max(m))]
+
+# ----------------------------
+# Helper: memoized scoring
+# ----------------------------
+# Inputs are quantized to tenths, so the same task scored again (e.g. on
+# every chatbot turn) is a dict lookup instead of a table read or kernel run.
+@functools.lru_cache(maxsize=4096)
+def _prioritize_cached(d10: int, im10: int, df10: int) -> tuple:
+    if d10 % 10 == im10 % 10 == df10 % 10 == 0:   # whole numbers: precomputed
+        score = float(PRIORITY_LUT[d10 // 10 - int(_DD_LO), im10 // 10 - int(_IM_LO), df10 // 10 - int(_DF_LO)])
+    else:
+        score = compute_priority(d10 / 10, im10 / 10, df10 / 10)
+    if np.isnan(score):
+        raise ValueError(f"No rule fires for inputs ({d10 / 10}, {im10 / 10}, {df10 / 10})")
+    return round(score, 2), label_for_priority(score)
 
 # ----------------------------
 # Public API
@@ -107,32 +453,47 @@ def prioritize_task(days_to_deadline: float, importance_score: float, difficulty
         dict with fields:
             - score: float in [0,100]
             - label: 'very low'|'low'|'medium'|'high'|'very high'
-            - inputs: echo of normalized inputs
+            - inputs: echo of normalized inputs (clamped, rounded to 0.1)
     """
     # Clamp inputs to universe ranges
-    d = np.clip(days_to_deadline, deadline_days.universe.min(), deadline_days.universe.max())
-    im = np.clip(importance_score, importance.universe.min(), importance.universe.max())
-    df = np.clip(difficulty_score, difficulty.universe.min(), difficulty.universe.max())
-
-    priority_engine.input['deadline_days'] = float(d)
-    priority_engine.input['importance'] = float(im)
-    priority_engine.input['difficulty'] = float(df)
+    d = _DD_LO if days_to_deadline < _DD_LO else (_DD_HI if days_to_deadline > _DD_HI else float(days_to_deadline))
+    im = _IM_LO if importance_score < _IM_LO else (_IM_HI if importance_score > _IM_HI else float(importance_score))
+    df = _DF_LO if difficulty_score < _DF_LO else (_DF_HI if difficulty_score > _DF_HI else float(difficulty_score))
 
-    # Compute
-    priority_engine.compute()
-    score = float(priority_engine.output['priority'])
-    label = _label_for_priority(score)
+    # Quantize to tenths and look up the (cached) score
+    d10, im10, df10 = int(round(d * 10)), int(round(im * 10)), int(round(df * 10))
+    score, label = _prioritize_cached(d10, im10, df10)
 
     return {
-        'score': round(score, 2),
+        'score': score,
         'label': label,
         'inputs': {
-            'days_to_deadline': float(d),
-            'importance': float(im),
-            'difficulty': float(df),
+            'days_to_deadline': d10 / 10,
+            'importance': im10 / 10,
+            'difficulty': df10 / 10,
         }
     }
 
+def prioritize_tasks_batch(days: np.ndarray, imp: np.ndarray, diff: np.ndarray) -> tuple:
+    """
+    Vectorized prioritize_task for many tasks at once.
+
+    Args:
+        days, imp, diff: array-likes of equal shape, same ranges as prioritize_task
+
+    Returns:
+        (scores, labels): float array of scores in [0,100] and an object
+        array of labels, both of the input shape. Same clamping, 0.1
+        quantization and results as prioritize_task; NaN score and None
+        label where no rule fires.
+    """
+    d = np.round(np.clip(days, _DD_LO, _DD_HI) * 10) / 10
+    im = np.round(np.clip(imp, _IM_LO, _IM_HI) * 10) / 10
+    df = np.round(np.clip(diff, _DF_LO, _DF_HI) * 10) / 10
+    scores = _lookup_or_compute(d, im, df)
+    labels = np.where(np.isnan(scores), None, np.array(LABELS, dtype=object)[_label_indices(scores)])
+    return np.round(scores, 2), labels
+
 # ----------------------------
 # Example usage
 # ----------------------------
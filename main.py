@@ -1,11 +1,27 @@
 import os
 import time
 import json
+import random
 import sys
-from typing import List, Dict, Optional
+import threading
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
 from groq import Groq
 from dotenv import load_dotenv
 
+try:
+    import orjson  # optional: faster parsing of large task files
+
+    def _json_loads(b):
+        try:
+            return orjson.loads(b)
+        except orjson.JSONDecodeError:
+            return json.loads(b)  # NaN/Infinity, which stdlib json accepts and orjson rejects
+except ImportError:
+    _json_loads = json.loads
+
 # ===========================
 # 0) Env & Groq Client Setup
 # ===========================
@@ -22,18 +38,59 @@ PREFERRED_MODELS: List[str] = [
     "llama-3.3-70b-versatile",   # stronger, a bit slower
 ]
 
+# The picked model is cached on disk so short CLI runs skip the
+# models.list() round-trip; a stale or unreadable cache just means we ask again.
+MODEL_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "fuzzytp", "model.json")
+MODEL_CACHE_TTL = 24 * 3600  # seconds
+
+def _read_cached_model() -> Optional[str]:
+    try:
+        if time.time() - os.path.getmtime(MODEL_CACHE_PATH) < MODEL_CACHE_TTL:
+            with open(MODEL_CACHE_PATH, "r", encoding="utf-8") as f:
+                model = json.load(f).get("model")
+            if model in PREFERRED_MODELS:
+                return model
+    except Exception:
+        pass
+    return None
+
+def _write_cached_model(model: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(MODEL_CACHE_PATH), exist_ok=True)
+        with open(MODEL_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"model": model}, f)
+    except Exception:
+        pass
+
 def _pick_available_model() -> str:
     """Pick the first available model from PREFERRED_MODELS; else fall back."""
+    cached = _read_cached_model()
+    if cached:
+        return cached
     try:
         available = {m.id for m in client.models.list().data}
         for m in PREFERRED_MODELS:
             if m in available:
+                _write_cached_model(m)
                 return m
     except Exception:
         pass
     return "llama-3.1-8b-instant"
 
-LLAMA_MODEL = _pick_available_model()
+@functools.lru_cache(maxsize=1)
+def _pick_cached(bucket: int) -> str:
+    """Memoized pick; `bucket` is the current hour, so a new hour re-picks."""
+    return _pick_available_model()
+
+_pick_lock = threading.Lock()
+
+def _current_model() -> str:
+    # single-flight: at the hour boundary only one caller re-picks, the rest wait for its answer
+    bucket = int(time.time()) // 3600
+    with _pick_lock:
+        return _pick_cached(bucket)
+
+LLAMA_MODEL = _current_model()
 
 # ===========================
 # 1) Prompting Utilities
@@ -52,6 +109,16 @@ def _safe(val, max_len: int = 300) -> str:
     s = str(val)
     return s[:max_len]
 
+def _format_task_line(t: Dict) -> str:
+    """One prompt line for a task; see _format_task_context for the accepted shape."""
+    score = t.get("priority_score")
+    return (
+        f"- {_safe(t.get('name'))} | deadline:{_safe(t.get('deadline'))} | "
+        f"importance:{_safe(t.get('importance'))} | difficulty:{_safe(t.get('difficulty'))} | "
+        f"priority:{_safe(t.get('priority_label', t.get('priority', 'N/A')))} "
+        f"({'N/A' if score is None else f'{float(score):.2f}'})"
+    )
+
 def _format_task_context(tasks: List[Dict]) -> str:
     """
     Accepts tasks like:
@@ -63,57 +130,72 @@ def _format_task_context(tasks: List[Dict]) -> str:
         "priority_label": "Very Low..Very High|Low..High|etc.",
         "priority_score": 0.87
       }
-    Falls back gracefully if some fields are missing.
+    Falls back gracefully if some fields are missing. Tasks from
+    load_tasks_from_json carry a pre-rendered "_formatted" line, used as-is.
     """
-    lines = []
-    for t in tasks:
-        name = _safe(t.get("name"))
-        deadline = _safe(t.get("deadline"))
-        importance = _safe(t.get("importance"))
-        difficulty = _safe(t.get("difficulty"))
-        label = _safe(t.get("priority_label", t.get("priority", "N/A")))
-        score = t.get("priority_score")
-        score_str = "N/A" if score is None else f"{float(score):.2f}"
-        lines.append(
-            f"- {name} | deadline:{deadline} | importance:{importance} | "
-            f"difficulty:{difficulty} | priority:{label} ({score_str})"
-        )
-    return "\n".join(lines) if lines else "- (no tasks provided)"
+    return "\n".join([t.get("_formatted") or _format_task_line(t) for t in tasks]) or "- (no tasks provided)"
 
 # ===========================
 # 2) Core Chat Function (history + knobs + fallback)
 # ===========================
+# Caps concurrent Groq requests across threads (batch advice, UI chat) to stay under rate limits
+MAX_IN_FLIGHT = 4
+_llm_slots = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+# HTTP statuses that won't succeed on retry (bad request, auth, missing, invalid)
+_NON_RETRIABLE_STATUS = {400, 401, 403, 404, 422}
+
 def chat_with_llama_messages(
     messages: List[Dict[str, str]],
     temperature: float = 0.4,
     max_tokens: int = 512,
     retries: int = 2,
     backoff_base: float = 0.6,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> str:
     """
     Calls Groq chat.completions with retries and model fallback.
     Messages must be a list of {"role": "...", "content": "..."}.
+    If `on_token` is given the reply is streamed and each text delta is
+    passed to it as it arrives; the full reply is still returned.
     """
     last_error = None
-    models_to_try = [LLAMA_MODEL] + [m for m in PREFERRED_MODELS if m != LLAMA_MODEL]
+    current = _current_model()
+    models_to_try = [current] + [m for m in PREFERRED_MODELS if m != current]
+    parts: List[str] = []
 
     for attempt in range(retries + 1):
         for model in models_to_try:
             try:
-                resp = client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
-                return resp.choices[0].message.content.strip()
+                with _llm_slots:
+                    resp = client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        stream=on_token is not None,
+                    )
+                    if on_token is None:
+                        return resp.choices[0].message.content.strip()
+                    for chunk in resp:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+                            on_token(delta)
+                    return "".join(parts).strip()
             except Exception as e:
                 last_error = e
+                if parts:
+                    # Tokens were already shown; keep them rather than replaying the reply
+                    return "".join(parts).strip()
                 if "model_decommissioned" in str(e):
                     continue
+                if getattr(e, "status_code", None) in _NON_RETRIABLE_STATUS:
+                    return f"An error occurred: {last_error}"
                 break
         if attempt < retries:
-            time.sleep(backoff_base * (2 ** attempt))
+            # Full jitter so concurrent callers don't retry in lockstep
+            time.sleep(random.uniform(0, backoff_base * (2 ** attempt)))
 
     return f"An error occurred: {last_error}"
 
@@ -165,29 +247,47 @@ Use plain English. Keep it tight.
         "advice": advice,
     }
 
+def generate_task_advice_batch(
+    tasks: List[Dict],
+    temperature: float = 0.3,
+    max_workers: int = 8,
+) -> List[Dict[str, str]]:
+    """
+    generate_task_advice for every task (normalized shape, see
+    load_tasks_from_json), issued concurrently. Results keep input order.
+    """
+    def _one(t: Dict) -> Dict[str, str]:
+        return generate_task_advice(
+            task_name=t["name"],
+            deadline=t["deadline"],
+            importance=t["importance"],
+            difficulty=t["difficulty"],
+            priority_score=float(t.get("priority_score") or 0.0),
+            priority_label=t.get("priority_label"),
+            temperature=temperature,
+        )
+
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+        return list(pool.map(_one, tasks))
+
 # ===========================
 # 4) Stateful Chatbot
 # ===========================
-chat_history: List[Dict[str, str]] = [{"role": "system", "content": SYSTEM_PROMPT}]
-
-def _prune_history(max_turn_pairs: int = 8) -> None:
-    """Keep the system message + last `max_turn_pairs` user/assistant turns."""
-    non_system_indices = [i for i, m in enumerate(chat_history) if m["role"] != "system"]
-    keep = max_turn_pairs * 2
-    excess = max(0, len(non_system_indices) - keep)
-    for _ in range(excess):
-        for i, m in enumerate(chat_history):
-            if m["role"] != "system":
-                del chat_history[i]
-                break
+# System prompt is kept apart from the turns; the deque keeps only the last
+# MAX_TURN_PAIRS user/assistant pairs and evicts the oldest on append.
+MAX_TURN_PAIRS = 8
+_SYSTEM_MSG: Dict[str, str] = {"role": "system", "content": SYSTEM_PROMPT}
+_turn_buffer: deque = deque(maxlen=2 * MAX_TURN_PAIRS)
 
 def chatbot_reply(
     user_query: str,
     tasks: List[Dict],
     temperature: float = 0.4,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, str]:
-    """Returns {"reply": "..."}."""
-    _prune_history(max_turn_pairs=8)
+    """Returns {"reply": "..."}. `on_token` streams the reply (see chat_with_llama_messages)."""
     task_context = _format_task_context(tasks)
     user_msg = (
         f"Current tasks:\n{task_context}\n\n"
@@ -195,20 +295,20 @@ def chatbot_reply(
         f"Answer clearly and briefly. If ranking tasks, cite numeric scores."
     )
 
-    messages = chat_history + [{"role": "user", "content": user_msg}]
+    messages = [_SYSTEM_MSG, *_turn_buffer, {"role": "user", "content": user_msg}]
     reply = chat_with_llama_messages(
         messages,
         temperature=temperature,
         max_tokens=512,
+        on_token=on_token,
     )
-    chat_history.append({"role": "user", "content": user_msg})
-    chat_history.append({"role": "assistant", "content": reply})
+    _turn_buffer.append({"role": "user", "content": user_msg})
+    _turn_buffer.append({"role": "assistant", "content": reply})
     return {"reply": reply}
 
 def reset_chat_history() -> None:
     """Optional helper—reset history for a fresh session."""
-    chat_history.clear()
-    chat_history.append({"role": "system", "content": SYSTEM_PROMPT})
+    _turn_buffer.clear()
 
 # ===========================
 # 5) JSON Loader (Member 1 output)
@@ -291,7 +391,7 @@ def _normalize_task(raw: Dict) -> Optional[Dict]:
         # If Member 1 gave a string label in "priority"
         priority_label = priority_label or pr
 
-    return {
+    norm = {
         "name": _safe(name, 200),
         "deadline": _coerce_deadline(deadline) or "moderate",
         "importance": (str(importance).lower() if importance else "medium"),
@@ -299,12 +399,17 @@ def _normalize_task(raw: Dict) -> Optional[Dict]:
         "priority_label": _coerce_label(priority_label) or "Medium",
         "priority_score": _coerce_score(priority_score) if priority_score is not None else None,
     }
+    # Prompt line rendered once here instead of on every chat turn
+    norm["_formatted"] = _format_task_line(norm)
+    return norm
 
 def load_tasks_from_json(path: str) -> List[Dict]:
     """Load tasks from a JSON file and normalize them."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(path, "rb") as f:
+        return normalize_tasks(_json_loads(f.read()))
 
+def normalize_tasks(data) -> List[Dict]:
+    """Normalize already-parsed task JSON (a list, or an object with a 'tasks' array)."""
     if isinstance(data, dict) and "tasks" in data:
         raw_tasks = data["tasks"]
     elif isinstance(data, list):
@@ -402,4 +507,11 @@ if __name__ == "__main__":
             print("Chat history reset.")
             continue
 
-        print("Chatbot:", chatbot_reply(user_input, tasks)["reply"])
+        # Stream tokens as they arrive; errors come back as a plain reply
+        print("Chatbot: ", end="", flush=True)
+        shown: List[str] = []
+        def _echo(token: str) -> None:
+            shown.append(token)
+            print(token, end="", flush=True)
+        reply = chatbot_reply(user_input, tasks, on_token=_echo)["reply"]
+        print("" if shown else reply)
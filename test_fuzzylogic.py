@@ -0,0 +1,65 @@
+import itertools
+import math
+
+import numpy as np
+
+import fuzzylogic as fl
+
+
+def _has_nan_corner(d, im, df):
+    cells = itertools.product(*((math.floor(v), math.ceil(v)) for v in (d, im, df)))
+    return any(math.isnan(fl.PRIORITY_LUT[c]) for c in cells)
+
+
+def test_fractional_input_next_to_nan_cell():
+    # These blend LUT cells where no rule fires; skfuzzy still scores them
+    for inputs, expected in (((26.5, 5.7, 6.7), 30.0), ((16.3, 6.5, 6.3), 50.0)):
+        assert _has_nan_corner(*inputs)
+        result = fl.prioritize_task(*inputs)
+        assert result['score'] == round(fl.compute_priority(*inputs), 2) == expected
+
+
+def test_kernel_matches_skfuzzy_on_grid():
+    # Bit-for-bit against ControlSystemSimulation (uncached: a failed compute leaves its cache stale).
+    # The simulation reads the same frozen MF rows, so also pin them to skfuzzy's own float64.
+    from skfuzzy import control as ctrl
+    for mfs in (fl.ALL_DEADLINE_MFS, fl.ALL_IMPORTANCE_MFS, fl.ALL_DIFFICULTY_MFS, fl.ALL_PRIORITY_MFS):
+        assert mfs.dtype == fl.fuzz.trimf(fl.priority.universe, [35, 50, 65]).dtype
+    sim = ctrl.ControlSystemSimulation(fl.priority_ctrl, cache=False)
+    for d, im, df in itertools.product(*(v.universe for v in (fl.deadline_days, fl.importance, fl.difficulty))):
+        sim.input['deadline_days'], sim.input['importance'], sim.input['difficulty'] = d, im, df
+        try:
+            sim.compute()
+            expected = float(sim.output['priority'])
+        except (KeyError, ValueError):
+            expected = math.nan  # no rule fires
+        got = fl.compute_priority(d, im, df)
+        assert got == expected or (math.isnan(got) and math.isnan(expected)), (d, im, df, got, expected)
+        assert math.isnan(expected) or fl.PRIORITY_LUT[d, im, df] == expected
+
+
+def _reference_label(score):
+    # The original dict-based helper: memberships via fuzz.interp_membership, first max wins
+    memberships = {
+        label: fl.fuzz.interp_membership(fl.priority.universe, term.mf, score)
+        for label, term in zip(fl.LABELS, fl.priority.terms.values())
+    }
+    return max(memberships.items(), key=lambda x: x[1])[0]
+
+
+def test_labels_match_reference_helper():
+    crossovers = [c + e for c in (20.0, 40.0, 60.0, 80.0) for e in (-1e-9, -1e-14, 0.0, 1e-14, 1e-9)]
+    scores = list(np.linspace(-5.0, 105.0, 11001)) + crossovers + [0.0, 100.0]
+    expected = [_reference_label(s) for s in scores]
+    assert [fl.label_for_priority(s) for s in scores] == expected
+    assert [fl.LABELS[i] for i in fl._label_indices(scores)] == expected
+
+
+def test_labels_at_grid_ties():
+    # Scores within rounding of 60.0, where the last bits pick the label (values from ControlSystemSimulation)
+    for inputs, label in (((13, 7, 0), 'medium'), ((15, 9, 0), 'medium'), ((18, 8, 2), 'medium'),
+                          ((21, 9, 0), 'high'), ((24, 9, 1), 'high'), ((27, 9, 2), 'high'), ((30, 10, 0), 'high')):
+        result = fl.prioritize_task(*inputs)
+        assert (result['score'], result['label']) == (60.0, label)
+        scores, labels = fl.prioritize_tasks_batch(*([v] for v in inputs))
+        assert (scores[0], labels[0]) == (60.0, label)
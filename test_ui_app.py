@@ -0,0 +1,43 @@
+import ast
+import functools
+import os
+import random
+
+# ui_app builds and runs the Tk window at import, so pull just the row-extraction helpers out of its source
+_HELPERS = {'_extract_row', '_either', '_ROW_FIELDS', '_ALWAYS_READ', '_compile_extractor', '_row_extractor'}
+
+
+def _load_helpers():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ui_app.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    nodes = [
+        node for node in tree.body
+        if (isinstance(node, ast.FunctionDef) and node.name in _HELPERS)
+        or (isinstance(node, ast.Assign) and any(getattr(t, 'id', None) in _HELPERS for t in node.targets))
+    ]
+    ns = {'functools': functools}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), 'ui_app.py', 'exec'), ns)
+    assert _HELPERS <= ns.keys()
+    return ns
+
+
+def test_compiled_extractor_matches_extract_row():
+    ns = _load_helpers()
+    extract_row, row_extractor = ns['_extract_row'], ns['_row_extractor']
+    rng = random.Random(0)
+    fields = ['name', 'task_name', 'deadline', 'deadline_proximity', 'importance', 'difficulty',
+              'priority_score', 'priority_label', 'notes', 'days', 'extra']
+    values = [None, '', 'a', 0, 3.5]
+    priorities = [None, 0, 55.5, 70, True, 'high', '', [], {'score': 40, 'label': 'low'}, {'score': 0}, {}, {'label': 'x'}]
+
+    def task():
+        t = {k: rng.choice(values) for k in fields if rng.random() < 0.5}
+        if rng.random() < 0.7:
+            t['priority'] = rng.choice(priorities)
+        return t
+
+    for _ in range(20000):
+        # specialized on one task's schema, applied to its own and to another (mixed lists)
+        t, other = task(), task()
+        assert row_extractor([t])(t) == extract_row(t), t
+        assert row_extractor([other])(t) == extract_row(t), (other, t)
@@ -1,60 +1,217 @@
 # ui_app.py
-import os, json, threading
+import os, json, math, time, queue, hashlib, functools, threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
-from datetime import datetime
+
+try:
+    import orjson  # optional: faster load/save of tasks.json
+    def _json_loads(b):
+        try: return orjson.loads(b)
+        except orjson.JSONDecodeError: return json.loads(b)   # NaN/Infinity (older saves): only stdlib json reads them
+    _json_dumps = lambda o: orjson.dumps(o, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = lambda o: json.dumps(o, ensure_ascii=False, indent=2).encode("utf-8")
 
 # ---- Your modules ----
-import fuzzylogic as fl                     # fuzzy scoring (0..100) + label  :contentReference[oaicite:3]{index=3}
-import main as ai                           # Groq LLM / tasks json loader     :contentReference[oaicite:4]{index=4}
+# Imported on first use (and warmed in the background once the window is up): fuzzylogic
+# pulls in skfuzzy/numba and main builds the Groq client, which would hold up the first paint.
+_fl = None                                  # fuzzy scoring (0..100) + label  :contentReference[oaicite:3]{index=3}
+_ai = None                                  # Groq LLM / tasks json loader     :contentReference[oaicite:4]{index=4}
+
+def _get_fl():
+    global _fl
+    if _fl is None:
+        import fuzzylogic
+        _fl = fuzzylogic
+    return _fl
+
+def _get_ai():
+    global _ai
+    if _ai is None:
+        import main
+        _ai = main
+    return _ai
 
 TASKS_PATH = "tasks.json"                   # your shared storage              :contentReference[oaicite:5]{index=5}
 
 # ---------- JSON I/O ----------
+# Parsed tasks.json, keyed on (mtime_ns, size) so Tk callbacks skip the re-read + parse
+# when nothing changed on disk. Callers get their own list and task dicts (see _copy_tasks).
+# Writes go through a single background writer; while any are queued ("pending")
+# the cache, not the file, is the source of truth. "gen" counts saves, so a reader
+# that parsed the file while one was queued doesn't overwrite the newer data.
+_TASKS_CACHE = {"stamp": None, "data": None, "pending": 0, "gen": 0}
+_cache_lock = threading.Lock()
+_io_queue = queue.Queue()
+_LAST_WRITE = {"hash": None, "stamp": None}   # digest + stamp of the last tasks.json we wrote (I/O thread only)
+
+def _file_stamp():
+    st = os.stat(TASKS_PATH)
+    return (st.st_mtime_ns, st.st_size)
+
 def _ensure_tasks_file():
     if not os.path.exists(TASKS_PATH):
         with open(TASKS_PATH, "w", encoding="utf-8") as f:
             json.dump({"tasks": []}, f, ensure_ascii=False, indent=2)
 
+def _copy_tasks(data):
+    """
+    Copy of the task list and each task dict, much cheaper than a deepcopy (or a re-parse).
+    Nested values such as "priority" are shared: replace them, don't mutate them in place.
+    """
+    return dict(data, tasks=[dict(t) if type(t) is dict else t for t in data["tasks"]])
+
 def load_tasks_raw():
-    """Load exactly as stored on disk (dict with 'tasks')."""
+    """Load exactly as stored on disk (dict with 'tasks'); cached until the file changes."""
+    # the cached objects are never mutated (callers get copies), so copying happens outside the lock
+    with _cache_lock:
+        pending, cached, gen, data = (_TASKS_CACHE[k] for k in ("pending", "stamp", "gen", "data"))
+    if pending:
+        return _copy_tasks(data)
     _ensure_tasks_file()
-    with open(TASKS_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    if isinstance(data, list):
-        # normalize old shape into object
-        data = {"tasks": data}
-    data.setdefault("tasks", [])
-    return data
-
-def save_tasks_raw(data_obj):
-    """Persist canonical object {'tasks': [...]}."""
-    with open(TASKS_PATH, "w", encoding="utf-8") as f:
-        json.dump(data_obj, f, ensure_ascii=False, indent=2)
+    stamp = _file_stamp()
+    if stamp != cached:
+        with open(TASKS_PATH, "rb") as f:
+            data = _json_loads(f.read())
+        if isinstance(data, list):
+            # normalize old shape into object
+            data = {"tasks": data}
+        data.setdefault("tasks", [])
+        with _cache_lock:
+            if _TASKS_CACHE["gen"] == gen:   # else a save landed meanwhile: its data is newer than what we read
+                _TASKS_CACHE.update(stamp=stamp, data=data)
+            else:
+                data = _TASKS_CACHE["data"]
+    return _copy_tasks(data)
+
+def save_tasks_raw(data_obj, on_done=None):
+    """
+    Persist canonical object {'tasks': [...]}; returns it for chaining into refresh_table.
+    The cache is updated now and the file is written by the I/O thread, which then
+    calls on_done() on the Tk thread.
+    """
+    snapshot = _copy_tasks(data_obj)
+    with _cache_lock:
+        _TASKS_CACHE["data"] = snapshot; _TASKS_CACHE["pending"] += 1; _TASKS_CACHE["gen"] += 1
+    _io_queue.put((snapshot, on_done))
+    return data_obj
+
+def _write_snapshot(snapshot):
+    """Write one snapshot to tasks.json and return the file's new stamp."""
+    buf = _json_dumps(snapshot)
+    h = hashlib.blake2b(buf, digest_size=16).digest()
+    stamp = _file_stamp() if os.path.exists(TASKS_PATH) else None
+    if h != _LAST_WRITE["hash"] or stamp != _LAST_WRITE["stamp"]:
+        # write a sibling temp file, then swap it in: readers never see a half-written tasks.json
+        tmp = TASKS_PATH + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(buf)
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, TASKS_PATH)
+        stamp = _file_stamp()
+        _LAST_WRITE.update(hash=h, stamp=stamp)
+    # else: same bytes as our last write and nobody touched the file since; skip the fsync + replace
+    return stamp
+
+def _post_to_tk(fn):
+    try:
+        root.after(0, fn)
+    except (tk.TclError, RuntimeError):
+        pass   # window already destroyed (save finished during shutdown): nothing left to update
+
+def _io_worker():
+    while True:
+        snapshot, on_done = _io_queue.get()
+        try:
+            try:
+                stamp, err = _write_snapshot(snapshot), None
+            except Exception as e:
+                stamp, err = None, e      # unknown file state: re-read it once the queue drains
+            with _cache_lock:
+                _TASKS_CACHE["stamp"] = stamp; _TASKS_CACHE["pending"] -= 1
+            if err is not None:
+                _post_to_tk(lambda e=err: messagebox.showerror("Error", f"Failed to save tasks.json:\n{e}"))
+            elif on_done is not None:
+                _post_to_tk(on_done)
+        finally:
+            _io_queue.task_done()   # always, or the join() after mainloop would hang shutdown
+
+threading.Thread(target=_io_worker, daemon=True).start()
 
 # ---------- Helpers ----------
+# Bucket labels indexed by the whole-number input (clamped to the spinbox range), instead of
+# re-running the if-ladders on every save: importance/difficulty >=7 high, >=4 medium;
+# days <=3 close, <=14 moderate (indexed by ceil, so 3.5 days is still "moderate").
+_IMP_LBL  = ("low",)*4 + ("medium",)*3 + ("high",)*4            # 0..10
+_DIFF_LBL = ("easy",)*4 + ("moderate",)*3 + ("hard",)*4         # 0..10
+_DEAD_LBL = ("close",)*4 + ("moderate",)*11 + ("far",)*16       # 0..30
+
+def _level(table, i) -> str:
+    return table[min(max(int(i), 0), len(table) - 1)]
+
 def _deadline_bucket(days: float) -> str:
-    if days <= 3: return "close"
-    if days <= 14: return "moderate"
-    return "far"
+    return _level(_DEAD_LBL, math.ceil(days))
 
 def _short(s: str, n=60):
     if not s: return ""
     return s if len(s) <= n else s[:n] + "…"
 
 def _recompute_priority(days: float, imp: float, diff: float):
-    """Run your fuzzy engine and return (score,label)."""
-    res = fl.prioritize_task(days_to_deadline=days, importance_score=imp, difficulty_score=diff)  # :contentReference[oaicite:6]{index=6}
-    return float(res["score"]), str(res["label"])
+    """
+    (score,label) from fl.prioritize_task: the precomputed table for whole-number inputs, the compiled
+    kernel for anything else (Add/Edit accept fractions). ValueError if no rule fires.
+    """
+    res = _get_fl().prioritize_task(days, imp, diff)
+    return res["score"], res["label"]
+
+def _numeric_inputs(t):
+    """(days, importance10, difficulty10) as saved by Add/Edit; None for tasks that only carry string buckets."""
+    try: return float(t["days"]), float(t["importance10"]), float(t["difficulty10"])
+    except (KeyError, TypeError, ValueError): return None
+
+# Days per deadline bucket, with the synonyms main.DEADLINE_MAP accepts (kept here so the
+# Edit dialog doesn't depend on main having been imported, which fails without GROQ_API_KEY)
+_BUCKET_DAYS = {"close": 2, "near": 2, "soon": 2, "moderate": 7, "medium": 7, "far": 20, "distant": 20, "later": 20}
+
+def _guess_inputs(t):
+    """Edit-dialog starting values: the stored numbers, else days estimated from the deadline bucket."""
+    nums = _numeric_inputs(t)
+    if nums is not None: return nums
+    d = str(t.get("deadline") or t.get("deadline_proximity") or "moderate").strip().lower()
+    return (float(t["days"]) if "days" in t else _BUCKET_DAYS.get(d, 7),
+            float(t.get("importance10", 5)), float(t.get("difficulty10", 5)))
+
+def _warm_modules():
+    # import + JIT-compile (or load the cached build of) the kernels Add/Edit and Rescore run for
+    # fractional inputs, off the Tk thread, so the first Add isn't a pause
+    _get_fl().compute_priority_batch([1.0], [5.0], [5.0])
+    try: _get_ai()
+    except Exception: pass   # e.g. no GROQ_API_KEY: surfaces on the first chat message instead
+
+# Last normalized list handed to the LLM, keyed like _TASKS_CACHE on the file's (mtime_ns, size):
+# chat turns against an unchanged tasks.json skip the re-read + normalize. Treat it as read-only.
+_NORM_CACHE = {"stamp": None, "list": None}
 
 def _normalize_for_llm():
     """
     Use ai.load_tasks_from_json to get a normalized list the LLM expects:
     each item has strings + priority_score/priority_label.              :contentReference[oaicite:7]{index=7}
+    While saves are still queued the file is stale, so the in-memory tasks are normalized instead.
     """
     try:
-        return ai.load_tasks_from_json(TASKS_PATH)  # tolerant to many shapes  :contentReference[oaicite:8]{index=8}
+        with _cache_lock:
+            pending = _TASKS_CACHE["pending"]
+        if pending:
+            return _get_ai().normalize_tasks(load_tasks_raw())
+        _ensure_tasks_file()
+        stamp = _file_stamp()
+        if stamp == _NORM_CACHE["stamp"]:
+            return _NORM_CACHE["list"]
+        lst = _get_ai().load_tasks_from_json(TASKS_PATH)  # tolerant to many shapes  :contentReference[oaicite:8]{index=8}
+        _NORM_CACHE.update(stamp=stamp, list=lst)
+        return lst
     except Exception:
         # last-resort fallback if json temporarily invalid
         obj = load_tasks_raw()
@@ -91,7 +248,7 @@ def mk_btn(text, cmd):
     return tk.Button(sidebar, text=text, fg="white", bg="#43464b", activebackground="#52565c",
                      relief="flat", padx=12, pady=10, command=cmd)
 
-mk_btn("Tasks",   lambda: (refresh_table(), switch(page_tasks))).pack(fill="x", padx=14, pady=(16, 8))
+mk_btn("Tasks",   lambda: (refresh_table_debounced(), switch(page_tasks))).pack(fill="x", padx=14, pady=(16, 8))
 mk_btn("Add Task",lambda: switch(page_add)).pack(fill="x", padx=14, pady=8)
 mk_btn("Chatbot", lambda: switch(page_chat)).pack(fill="x", padx=14, pady=8)
 
@@ -104,7 +261,8 @@ btn_refresh = tk.Button(bar, text="Reload", width=10)
 btn_edit = tk.Button(bar, text="Edit", width=10)
 btn_delete = tk.Button(bar, text="Delete", width=10)
 btn_export = tk.Button(bar, text="Export CSV", width=12)
-for i, b in enumerate((btn_refresh, btn_edit, btn_delete, btn_export)):
+btn_rescore = tk.Button(bar, text="Rescore", width=10)
+for i, b in enumerate((btn_refresh, btn_edit, btn_delete, btn_export, btn_rescore)):
     b.pack(side="left", padx=(0 if i==0 else 8,0))
 
 columns = ("name","deadline","importance","difficulty","score","label","notes")
@@ -116,32 +274,172 @@ tree.configure(yscrollcommand=vsb.set)
 tree.pack(side="left", fill="both", expand=True, padx=(16,0), pady=(0,16))
 vsb.pack(side="left", fill="y", padx=(0,16), pady=(0,16))
 
-def refresh_table():
-    tree.delete(*tree.get_children())
-    obj = load_tasks_raw()
-    for t in obj["tasks"]:
-        # Extract score/label stored under either flat keys or nested priority
-        pr = t.get("priority", {})
-        score = t.get("priority_score") or (pr.get("score") if isinstance(pr, dict) else (pr if isinstance(pr,(int,float)) else None))
-        label = t.get("priority_label") or (pr.get("label") if isinstance(pr, dict) else (pr if isinstance(pr,str) else None))
-        tree.insert("", "end", values=(
-            t.get("name") or t.get("task_name") or "(no name)",
-            t.get("deadline") or t.get("deadline_proximity") or "moderate",
-            t.get("importance","medium"),
-            t.get("difficulty","moderate"),
-            f"{float(score):.2f}" if score is not None else "-",
-            label or "-",
-            _short(t.get("notes",""))
-        ))
+_row_ids = {}   # displayed task name -> Treeview item id; empty when names aren't unique
+_name_index = {}   # task name -> position in obj["tasks"] as last saved/shown; empty when names aren't unique
+
+def _task_name(t):
+    return t.get("name") or t.get("task_name")
+
+def _reindex(tasks):
+    _name_index.clear()
+    _name_index.update((_task_name(t), i) for i, t in enumerate(tasks))
+    if len(_name_index) != len(tasks): _name_index.clear()
+
+def _index_added(tasks):
+    """Record tasks[-1], just appended, without rescanning; a clash (or an index already off) clears it."""
+    name, n = _task_name(tasks[-1]), len(tasks) - 1
+    if len(_name_index) == n and name not in _name_index: _name_index[name] = n
+    else: _name_index.clear()
+
+def _index_renamed(old, new):
+    if old == new: return
+    i = _name_index.pop(old, None)
+    if i is None or new in _name_index: _name_index.clear()
+    else: _name_index[new] = i
+
+def _find_task(tasks, name):
+    """Position of the task called `name` (None if absent); the index is checked, and scanned past if stale."""
+    i = _name_index.get(name)
+    if i is not None and i < len(tasks) and _task_name(tasks[i]) == name: return i
+    return next((i for i, t in enumerate(tasks) if _task_name(t) == name), None)
+
+def _extract_row(t, _get=dict.get):
+    """
+    (name, deadline, importance, difficulty, score, label, notes), None where missing.
+    Score/label come from the flat keys or the nested priority (dict or bare value).
+    """
+    pr = _get(t, "priority"); tp = type(pr)
+    score = _get(t, "priority_score") or (pr.get("score") if tp is dict else pr if tp is int or tp is float else None)
+    label = _get(t, "priority_label") or (pr.get("label") if tp is dict else pr if tp is str else None)
+    return (_get(t, "name") or _get(t, "task_name"), _get(t, "deadline") or _get(t, "deadline_proximity"),
+            _get(t, "importance"), _get(t, "difficulty"), score, label, _get(t, "notes"))
+
+def _either(keys, a, b):
+    # source for `t.get(a) or t.get(b)` when we know which of the two keys exist
+    if a in keys: return f"t[{a!r}] or t[{b!r}]" if b in keys else f"t[{a!r}] or None"
+    return f"t[{b!r}]" if b in keys else "None"
+
+_ROW_FIELDS = frozenset(("name", "task_name", "deadline", "deadline_proximity", "importance", "difficulty",
+                          "priority", "priority_score", "priority_label", "notes"))
+# ...of which the generated return expression always subscripts (never behind an `or`)
+_ALWAYS_READ = {"name", "deadline", "importance", "difficulty", "priority_score", "priority_label", "notes"}
+
+@functools.lru_cache(maxsize=16)
+def _compile_extractor(keys, ptype):
+    """
+    _extract_row specialized (via exec) for tasks carrying exactly `keys` of _ROW_FIELDS and
+    this type of "priority": plain subscripts, no .get/type dispatch. The guard checks the
+    other fields are absent and lets a KeyError flag a missing one; such rows take _extract_row.
+    """
+    key = lambda k: f"t[{k!r}]" if k in keys else "None"
+    if ptype is dict: score, label = "t['priority'].get('score')", "t['priority'].get('label')"
+    else: score, label = ("t['priority']" if ptype is int or ptype is float else "None"), ("t['priority']" if ptype is str else "None")
+    if "priority_score" in keys: score = f"t['priority_score'] or {score}"
+    if "priority_label" in keys: label = f"t['priority_label'] or {label}"
+    lines = ["def extract(t):"]
+    absent = sorted(_ROW_FIELDS - keys)
+    if absent: lines.append("    if " + " or ".join(f"{k!r} in t" for k in absent) + ": return _extract_row(t)")
+    lines.append("    try:")
+    rest = sorted(keys - _ALWAYS_READ)
+    if rest: lines.append("        " + ", ".join(f"t[{k!r}]" for k in rest))
+    if "priority" in keys and ptype is not dict:  # a dict priority is checked by .get raising AttributeError
+        lines.append("        if type(t['priority']) is not _ptype: return _extract_row(t)")
+    lines += [
+        f"        return ({_either(keys, 'name', 'task_name')}, {_either(keys, 'deadline', 'deadline_proximity')},",
+        f"                {key('importance')}, {key('difficulty')}, {score}, {label}, {key('notes')})",
+        "    except (KeyError, AttributeError):",
+        "        return _extract_row(t)",
+    ]
+    ns = {"_ptype": ptype, "_extract_row": _extract_row}
+    exec("\n".join(lines) + "\n", ns)
+    return ns["extract"]
+
+def _row_extractor(tasks):
+    """
+    Extractor for a task list. A tasks.json mostly keeps one shape, and rows this app
+    writes share one, so specialize on the newest (last) task; other shapes still work.
+    """
+    t = tasks[-1] if tasks else None
+    if type(t) is not dict: return _extract_row
+    return _compile_extractor(_ROW_FIELDS.intersection(t), type(t.get("priority")))
+
+def _row_values(t, extract=_extract_row):
+    name, deadline, imp, diff, score, label, notes = extract(t)
+    return (
+        name or "(no name)",
+        deadline or "moderate",
+        "medium" if imp is None else imp,
+        "moderate" if diff is None else diff,
+        f"{float(score):.2f}" if score is not None else "-",
+        label or "-",
+        _short(notes)
+    )
+
+def _apply_changes(changed):
+    """Patch only the changed rows; False (nothing touched) if names collide and a rebuild is needed."""
+    removed = list(changed.get("removed", ())); updated = list(changed.get("updated", ())); added = list(changed.get("added", ()))
+    known = set(_row_ids)
+    if any(n not in known for n in removed) or any(old not in known for old, _ in updated): return False
+    known.difference_update(removed); known.difference_update(old for old, _ in updated)
+    for t in [t for _, t in updated] + added:
+        name = _row_values(t)[0]
+        if name in known: return False
+        known.add(name)
+    for name in removed: tree.delete(_row_ids.pop(name))
+    moved = [(_row_ids.pop(old), t) for old, t in updated]
+    for iid, t in moved:
+        vals = _row_values(t); tree.item(iid, values=vals); _row_ids[vals[0]] = iid
+    for t in added:
+        vals = _row_values(t); _row_ids[vals[0]] = tree.insert("", "end", values=vals)
+    return True
+
+def refresh_table(obj=None, changed=None):
+    """
+    Rebuild the table from `obj` (just saved) or, if None, from tasks.json.
+    `changed` = {"added": [task], "updated": [(old_name, task)], "removed": [name]}
+    patches just those rows instead (falls back to a rebuild if that's unsafe).
+    """
+    if changed is not None and _row_ids and _apply_changes(changed): return
+    if obj is None: obj = load_tasks_raw()
+    extract = _row_extractor(obj["tasks"])
+    rows = [_row_values(t, extract) for t in obj["tasks"]]   # format everything before touching Tk
+    _reindex(obj["tasks"])
+    tree.delete(*tree.get_children()); _row_ids.clear()
+    tree.configure(yscrollcommand="")               # no scrollbar update per inserted row
+    insert = tree.insert
+    for vals in rows:
+        _row_ids[vals[0]] = insert("", "end", values=vals)
+    tree.configure(yscrollcommand=vsb.set)
+    if len(_row_ids) != len(rows): _row_ids.clear()   # duplicate names: rebuild every time
+
+_refresh_pending = {"id": None, "calls": []}
+
+def refresh_table_debounced(obj=None, changed=None):
+    """
+    refresh_table, run 50 ms after the last of a burst of calls. A lone call runs
+    as given; several coalesce into one rebuild from the newest state.
+    """
+    _refresh_pending["calls"].append((obj, changed))
+    if _refresh_pending["id"] is not None: root.after_cancel(_refresh_pending["id"])
+    _refresh_pending["id"] = root.after(50, _flush_refresh)
+
+def _flush_refresh():
+    calls = _refresh_pending["calls"]
+    _refresh_pending.update(id=None, calls=[])
+    if len(calls) == 1: refresh_table(*calls[0])
+    else: refresh_table(calls[-1][0])
 
 def delete_selected():
     sel = tree.selection()
     if not sel: return messagebox.showinfo("Delete", "Select a row first.")
     name = tree.item(sel[0])["values"][0]
     if not messagebox.askyesno("Confirm", f"Delete '{name}'?"): return
-    obj = load_tasks_raw()
-    obj["tasks"] = [t for t in obj["tasks"] if (t.get("name") or t.get("task_name")) != name]
-    save_tasks_raw(obj); refresh_table()
+    obj = load_tasks_raw(); tasks = obj["tasks"]
+    i = _find_task(tasks, name)
+    if i is not None and name in _name_index: del tasks[i]   # names unique: just this one
+    else: obj["tasks"] = tasks = [t for t in tasks if _task_name(t) != name]
+    _reindex(tasks)
+    refresh_table_debounced(save_tasks_raw(obj), changed={"removed": [name]})
 
 def open_edit():
     sel = tree.selection()
@@ -151,128 +449,151 @@ def open_edit():
 
     # locate in json
     obj = load_tasks_raw()
-    t = None
-    for it in obj["tasks"]:
-        nm = it.get("name") or it.get("task_name")
-        if nm == current_name:
-            t = it; break
+    i = _find_task(obj["tasks"], current_name)
+    t = None if i is None else obj["tasks"][i]
     if t is None: return messagebox.showerror("Error", "Task not found in JSON.")
 
     # derive numeric for edit
-    # keep previous numeric hints if present; otherwise estimate
-    days = float(t.get("days", 7))
-    imp = float(t.get("importance10", 5))
-    diff= float(t.get("difficulty10", 5))
-    if "days" not in t:
-        # guess from deadline bucket
-        d = (t.get("deadline") or t.get("deadline_proximity") or "moderate")
-        days = 2 if d=="close" else 7 if d=="moderate" else 20
+    # keep previous numeric hints if present; otherwise estimate from the deadline bucket
+    days, imp, diff = _guess_inputs(t)
 
     win = tk.Toplevel(root); win.title(f"Edit – {current_name}"); win.geometry("420x300")
 
     def row(lbl):
         fr = tk.Frame(win); fr.pack(fill="x", padx=14, pady=6); tk.Label(fr, text=lbl, width=16, anchor="w").pack(side="left"); return fr
-    r1=row("Task Name"); e_name=tk.Entry(r1, width=28); e_name.pack(side="left"); e_name.insert(0, current_name)
-    r2=row("Days (0–30)"); s_days=tk.Spinbox(r2, from_=0, to=30, width=6); s_days.pack(side="left"); s_days.delete(0,"end"); s_days.insert(0, str(int(days)))
-    r3=row("Importance (0–10)"); s_imp=tk.Spinbox(r3, from_=0, to=10, width=6); s_imp.pack(side="left"); s_imp.delete(0,"end"); s_imp.insert(0, str(int(imp)))
-    r4=row("Difficulty (0–10)"); s_diff=tk.Spinbox(r4, from_=0, to=10, width=6); s_diff.pack(side="left"); s_diff.delete(0,"end"); s_diff.insert(0, str(int(diff)))
-    r5=row("Notes"); e_notes=tk.Entry(r5, width=28); e_notes.pack(side="left"); e_notes.insert(0, t.get("notes",""))
+    # pre-filled through Tk variables (one set per field); save_edit reads them back, which also keeps them alive
+    v_name = tk.StringVar(win, value=current_name); v_notes = tk.StringVar(win, value=t.get("notes",""))
+    v_days = tk.StringVar(win, value=str(int(days))); v_imp = tk.StringVar(win, value=str(int(imp))); v_diff = tk.StringVar(win, value=str(int(diff)))
+    r1=row("Task Name"); tk.Entry(r1, width=28, textvariable=v_name).pack(side="left")
+    r2=row("Days (0–30)"); tk.Spinbox(r2, from_=0, to=30, width=6, textvariable=v_days).pack(side="left")
+    r3=row("Importance (0–10)"); tk.Spinbox(r3, from_=0, to=10, width=6, textvariable=v_imp).pack(side="left")
+    r4=row("Difficulty (0–10)"); tk.Spinbox(r4, from_=0, to=10, width=6, textvariable=v_diff).pack(side="left")
+    r5=row("Notes"); tk.Entry(r5, width=28, textvariable=v_notes).pack(side="left")
 
     def save_edit():
         try:
-            name = e_name.get().strip()
-            days = float(s_days.get()); imp=float(s_imp.get()); dif=float(s_diff.get())
+            name = v_name.get().strip()
+            days = float(v_days.get()); imp=float(v_imp.get()); dif=float(v_diff.get())
             score, label = _recompute_priority(days, imp, dif)  # fuzzy  :contentReference[oaicite:9]{index=9}
             # update object
             t.clear()
             t.update({
                 "name": name,
                 "deadline": _deadline_bucket(days),
-                "importance": "high" if imp>=7 else "medium" if imp>=4 else "low",
-                "difficulty": "hard" if dif>=7 else "moderate" if dif>=4 else "easy",
+                "importance": _level(_IMP_LBL, imp),
+                "difficulty": _level(_DIFF_LBL, dif),
                 "days": days, "importance10": imp, "difficulty10": dif,
                 "priority": {"score": score, "label": label},   # stored canonical
                 "priority_score": score, "priority_label": label,  # redundant, good for compatibility  :contentReference[oaicite:10]{index=10}
-                "notes": e_notes.get().strip()
+                "notes": v_notes.get().strip()
             })
-            save_tasks_raw(obj); refresh_table(); win.destroy()
+            _index_renamed(current_name, _task_name(t))
+            refresh_table_debounced(save_tasks_raw(obj), changed={"updated": [(current_name, t)]}); win.destroy()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save:\n{e}")
 
     tk.Button(win, text="Save", width=10, command=save_edit).pack(pady=8)
 
-btn_refresh.config(command=refresh_table)
+btn_refresh.config(command=refresh_table_debounced)
 btn_delete.config(command=delete_selected)
 btn_edit.config(command=open_edit)
 
+def _extract_row_csv(t, extract=_extract_row):
+    name, deadline, imp, diff, score, label, notes = extract(t)
+    return [
+        name or "",
+        deadline or "",
+        "" if imp is None else imp,
+        "" if diff is None else diff,
+        f"{float(score):.2f}" if score is not None else "",
+        label or "",
+        "" if notes is None else notes
+    ]
+
 def export_csv():
     path = filedialog.asksaveasfilename(title="Export CSV", defaultextension=".csv", filetypes=[("CSV","*.csv")])
     if not path: return
     import csv
     obj = load_tasks_raw()
-    with open(path, "w", newline="", encoding="utf-8") as f:
+    with open(path, "w", newline="", encoding="utf-8", buffering=1<<20) as f:
         w = csv.writer(f)
         w.writerow(["name","deadline","importance","difficulty","priority_score","priority_label","notes"])
-        for t in obj["tasks"]:
-            pr=t.get("priority",{})
-            score=t.get("priority_score") or (pr.get("score") if isinstance(pr,dict) else (pr if isinstance(pr,(int,float)) else None))
-            label=t.get("priority_label") or (pr.get("label") if isinstance(pr,dict) else (pr if isinstance(pr,str) else None))
-            w.writerow([
-                t.get("name") or t.get("task_name") or "",
-                t.get("deadline") or t.get("deadline_proximity") or "",
-                t.get("importance",""),
-                t.get("difficulty",""),
-                f"{float(score):.2f}" if score is not None else "",
-                label or "",
-                t.get("notes","")
-            ])
+        extract = _row_extractor(obj["tasks"])
+        w.writerows(_extract_row_csv(t, extract) for t in obj["tasks"])
     messagebox.showinfo("Export", f"Saved to {path}")
 btn_export.config(command=export_csv)
 
+def recompute_all():
+    """Rescore every task in one batched call (e.g. after tasks.json was edited by hand)."""
+    obj = load_tasks_raw()
+    # Only tasks saved with numeric inputs; guessing numbers for string-only (legacy) tasks
+    # would overwrite their stored priority with a made-up one
+    scored, legacy, no_fire = [], [], []
+    for t in obj["tasks"]:
+        nums = _numeric_inputs(t)
+        if nums is None: legacy.append(_task_name(t) or "(no name)")
+        else: scored.append((t, nums))
+    if scored:
+        days, imp, diff = zip(*(nums for _, nums in scored))
+        scores, labels = _get_fl().prioritize_tasks_batch(days, imp, diff)   # same results as prioritize_task
+        for (t, _), score, label in zip(scored, scores.tolist(), labels.tolist()):
+            if label is None: no_fire.append(_task_name(t) or "(no name)"); continue  # keep the old score
+            t["priority"] = {"score": score, "label": label}
+            t["priority_score"] = score; t["priority_label"] = label
+        refresh_table_debounced(save_tasks_raw(obj))
+    msg = f"Rescored {len(scored) - len(no_fire)} task(s)."
+    if legacy: msg += f"\nSkipped (no numeric inputs saved; open Edit to set them): {', '.join(legacy)}"
+    if no_fire: msg += f"\nLeft unchanged (no fuzzy rule fires for their inputs): {', '.join(no_fire)}"
+    messagebox.showinfo("Rescore", msg)
+btn_rescore.config(command=recompute_all)
+
 # ====== Add Task Page ======
 tk.Label(page_add, text="Add Task (calculates & saves into tasks.json)", font=("Segoe UI", 16, "bold"), bg="white")\
   .pack(anchor="w", padx=16, pady=12)
 
 form = tk.Frame(page_add, bg="white"); form.pack(anchor="nw", padx=16, pady=6)
 def row(lbl): fr=tk.Frame(form, bg="white"); fr.pack(fill="x", pady=6); tk.Label(fr, text=lbl, width=16, anchor="w", bg="white").pack(side="left"); return fr
-r1=row("Task Name"); e_name=tk.Entry(r1, width=40); e_name.pack(side="left")
-r2=row("Days to deadline"); s_days=tk.Spinbox(r2, from_=0, to=30, width=6); s_days.pack(side="left"); s_days.delete(0,"end"); s_days.insert(0,"3")
-r3=row("Importance (0–10)"); s_imp=tk.Spinbox(r3, from_=0, to=10, width=6); s_imp.pack(side="left"); s_imp.delete(0,"end"); s_imp.insert(0,"8")
-r4=row("Difficulty (0–10)"); s_diff=tk.Spinbox(r4, from_=0, to=10, width=6); s_diff.pack(side="left"); s_diff.delete(0,"end"); s_diff.insert(0,"5")
-r5=row("Notes"); e_notes=tk.Entry(r5, width=40); e_notes.pack(side="left")
+# StringVars rather than IntVars so fractional input still parses the way float() sees it
+_name_var = tk.StringVar(value=""); _notes_var = tk.StringVar(value="")
+_days_var = tk.StringVar(value="3"); _imp_var = tk.StringVar(value="8"); _diff_var = tk.StringVar(value="5")
+r1=row("Task Name"); e_name=tk.Entry(r1, width=40, textvariable=_name_var); e_name.pack(side="left")
+r2=row("Days to deadline"); s_days=tk.Spinbox(r2, from_=0, to=30, width=6, textvariable=_days_var); s_days.pack(side="left")
+r3=row("Importance (0–10)"); s_imp=tk.Spinbox(r3, from_=0, to=10, width=6, textvariable=_imp_var); s_imp.pack(side="left")
+r4=row("Difficulty (0–10)"); s_diff=tk.Spinbox(r4, from_=0, to=10, width=6, textvariable=_diff_var); s_diff.pack(side="left")
+r5=row("Notes"); e_notes=tk.Entry(r5, width=40, textvariable=_notes_var); e_notes.pack(side="left")
 
 status = tk.Label(page_add, text="", fg="#555", bg="white"); status.pack(anchor="w", padx=16, pady=6)
 
 def add_task():
-    name = e_name.get().strip()
+    name = _name_var.get().strip()
     if not name: return messagebox.showwarning("Missing", "Please enter task name.")
     try:
-        days=float(s_days.get()); imp=float(s_imp.get()); dif=float(s_diff.get())
+        days=float(_days_var.get()); imp=float(_imp_var.get()); dif=float(_diff_var.get())
         score, label = _recompute_priority(days, imp, dif)  # fuzzy calc  :contentReference[oaicite:11]{index=11}
         obj = load_tasks_raw()
-        obj["tasks"].append({
+        task = {
             "name": name,
             "deadline": _deadline_bucket(days),                # for LLM context  :contentReference[oaicite:12]{index=12}
-            "importance": "high" if imp>=7 else "medium" if imp>=4 else "low",
-            "difficulty": "hard" if dif>=7 else "moderate" if dif>=4 else "easy",
+            "importance": _level(_IMP_LBL, imp),
+            "difficulty": _level(_DIFF_LBL, dif),
             "days": days, "importance10": imp, "difficulty10": dif,
             "priority": {"score": score, "label": label},     # canonical
             "priority_score": score, "priority_label": label, # compatibility  :contentReference[oaicite:13]{index=13}
-            "notes": e_notes.get().strip()
-        })
-        save_tasks_raw(obj)
-        status.config(text=f"Saved: {name} (Priority {label} – {score:.2f})")
-        e_name.delete(0,"end"); e_notes.delete(0,"end")
+            "notes": _notes_var.get().strip()
+        }
+        obj["tasks"].append(task); _index_added(obj["tasks"])
+        saved = lambda: status.config(text=f"Saved: {name} (Priority {label} – {score:.2f})")
+        refresh_table_debounced(save_tasks_raw(obj, on_done=saved), changed={"added": [task]})
+        status.config(text=f"Saving: {name} (Priority {label} – {score:.2f})…")
+        _name_var.set(""); _notes_var.set("")
     except Exception as e:
         messagebox.showerror("Error", f"Could not add task:\n{e}")
 
 btns = tk.Frame(page_add, bg="white"); btns.pack(anchor="w", padx=16, pady=6)
 tk.Button(btns, text="Add", width=12, command=add_task).pack(side="left")
 tk.Button(btns, text="Clear", width=10,
-          command=lambda:(e_name.delete(0,"end"), s_days.delete(0,"end"), s_days.insert(0,"3"),
-                          s_imp.delete(0,"end"), s_imp.insert(0,"8"),
-                          s_diff.delete(0,"end"), s_diff.insert(0,"5"),
-                          e_notes.delete(0,"end"), status.config(text=""))).pack(side="left", padx=8)
+          command=lambda:(_name_var.set(""), _days_var.set("3"), _imp_var.set("8"), _diff_var.set("5"),
+                          _notes_var.set(""), status.config(text=""))).pack(side="left", padx=8)
 
 # ====== Chat Page (uses Groq LLM in main.py) ======
 tk.Label(page_chat, text="Chatbot (Groq Llama via main.py)", font=("Segoe UI", 16, "bold"), bg="white")\
@@ -287,7 +608,7 @@ send_btn = tk.Button(bar, text="Send", width=10); send_btn.pack(side="left", pad
 typing_lbl = tk.Label(page_chat, text="", fg="#666", bg="white"); typing_lbl.pack(anchor="w", padx=16, pady=(0, 10))
 
 def chat_add(role, text):
-    ts = datetime.now().strftime("%H:%M")
+    lt = time.localtime(); ts = f"{lt.tm_hour:02d}:{lt.tm_min:02d}"
     chat_box.configure(state="normal")
     chat_box.insert("end", f"{role} ({ts}):\n", role)
     chat_box.insert("end", text + "\n\n")
@@ -295,6 +616,7 @@ def chat_add(role, text):
 
 def _chat_worker(msg):
     try:
+        ai = _get_ai()
         tasks_for_llm = _normalize_for_llm()      # consistent schema for LLM  :contentReference[oaicite:14]{index=14}
         reply_blob = ai.chatbot_reply(msg, tasks_for_llm)  # calls Groq with your system prompt  :contentReference[oaicite:15]{index=15}
         reply = reply_blob.get("reply","(no reply)")
@@ -312,14 +634,27 @@ def send_msg(event=None):
 
 send_btn.config(command=send_msg); entry.bind("<Return>", send_msg)
 
-def reset_chat():
-    ai.reset_chat_history()  # optional helper in main.py  :contentReference[oaicite:16]{index=16}
+def _clear_chat():
     chat_box.configure(state="normal"); chat_box.delete("1.0", "end"); chat_box.configure(state="disabled")
     chat_add("Bot", "Session reset. Ask me which task to do first!")
+
+def _reset_worker():
+    # first use imports main.py (Groq client + model pick), so keep it off the Tk thread
+    try:
+        _get_ai().reset_chat_history()  # optional helper in main.py  :contentReference[oaicite:16]{index=16}
+        done = _clear_chat
+    except Exception as e:
+        done = lambda e=e: chat_add("Bot", f"LLM error: {e}")
+    root.after(0, done)
+
+def reset_chat():
+    threading.Thread(target=_reset_worker, daemon=True).start()
 tk.Button(page_chat, text="Reset Chat", command=reset_chat).pack(anchor="e", padx=16, pady=(0, 8))
 
 # start
 refresh_table(); switch(page_tasks)
 chat_add("Bot", "Hi! Add tasks on the Add Task page. The Tasks panel reads from tasks.json; the chatbot uses your Groq model.")
 
+root.after(0, lambda: threading.Thread(target=_warm_modules, daemon=True).start())
 root.mainloop()
+_io_queue.join()   # let queued saves reach disk before exiting